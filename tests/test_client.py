@@ -1,8 +1,11 @@
 """Tests for the Timberlogs client."""
 
+import gc
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
+from pytest_httpx import HTTPXMock
 
 from timberlogs import (
     Flow,
@@ -371,6 +374,123 @@ class TestConfig:
         assert client._http_client is None
 
 
+class TestFlushDelivery:
+    """Tests for the enqueue -> flush -> HTTP delivery path."""
+
+    def test_batch_threshold_triggers_send(self, httpx_mock: HTTPXMock) -> None:
+        """Test that filling a batch sends it without an explicit flush."""
+        httpx_mock.add_response(json={"ok": True})
+        client = create_timberlogs(
+            source="test-app",
+            environment="development",
+            api_key="tb_test_key",
+            batch_size=3,
+            flush_interval=0,
+        )
+
+        client.info("one").info("two").info("three")
+
+        requests = httpx_mock.get_requests()
+        assert len(requests) == 1
+        logs = json.loads(requests[0].content)["logs"]
+        assert [log["message"] for log in logs] == ["one", "two", "three"]
+        assert logs[0]["level"] == "info"
+        assert logs[0]["source"] == "test-app"
+        assert logs[0]["environment"] == "development"
+        client.disconnect()
+
+    def test_flush_sends_queued_logs(self, httpx_mock: HTTPXMock) -> None:
+        """Test that an explicit flush delivers queued payloads."""
+        httpx_mock.add_response(json={"ok": True})
+        client = create_timberlogs(
+            source="test-app",
+            environment="development",
+            api_key="tb_test_key",
+            flush_interval=0,
+        )
+        client.set_user_id("user_123")
+
+        client.warn("careful", {"key": "value"})
+        client.flush()
+
+        logs = json.loads(httpx_mock.get_requests()[0].content)["logs"]
+        assert len(logs) == 1
+        assert logs[0]["level"] == "warn"
+        assert logs[0]["data"] == {"key": "value"}
+        assert logs[0]["userId"] == "user_123"
+        client.disconnect()
+
+    def test_flow_steps_delivered_on_flush(self, httpx_mock: HTTPXMock) -> None:
+        """Test that buffered flow steps drain on client flush."""
+        httpx_mock.add_response(json={"ok": True})
+        client = create_timberlogs(
+            source="test-app",
+            environment="development",
+            api_key="tb_test_key",
+            flush_interval=0,
+        )
+
+        flow = client.flow("checkout")
+        flow.info("Step 1").info("Step 2")
+        client.flush()
+
+        logs = json.loads(httpx_mock.get_requests()[0].content)["logs"]
+        assert [log["message"] for log in logs] == ["Step 1", "Step 2"]
+        assert [log["stepIndex"] for log in logs] == [0, 1]
+        assert logs[0]["flowId"] == flow.id
+        client.disconnect()
+
+    def test_flow_collected_before_flush_still_delivers(
+        self, httpx_mock: HTTPXMock
+    ) -> None:
+        """Test that a garbage-collected flow does not drop buffered steps."""
+        httpx_mock.add_response(json={"ok": True})
+        client = create_timberlogs(
+            source="test-app",
+            environment="development",
+            api_key="tb_test_key",
+            flush_interval=0,
+        )
+
+        # The temporary flow dies at the end of the expression.
+        client.flow("checkout").info("a").info("b")
+        gc.collect()
+        client.flush()
+
+        logs = json.loads(httpx_mock.get_requests()[0].content)["logs"]
+        assert [log["message"] for log in logs] == ["a", "b"]
+        client.disconnect()
+
+    def test_failed_flush_requeues_before_new_logs(
+        self, httpx_mock: HTTPXMock
+    ) -> None:
+        """Test that logs from a failed flush are retried first, in order."""
+        httpx_mock.add_response(status_code=500)
+        httpx_mock.add_response(json={"ok": True})
+        errors: list = []
+        client = create_timberlogs(
+            source="test-app",
+            environment="development",
+            api_key="tb_test_key",
+            flush_interval=0,
+            max_retries=0,
+            on_error=errors.append,
+        )
+
+        client.error("first")
+        client.flush()
+        assert len(errors) == 1
+
+        client.info("second")
+        client.flush()
+
+        requests = httpx_mock.get_requests()
+        assert len(requests) == 2
+        logs = json.loads(requests[1].content)["logs"]
+        assert [log["message"] for log in logs] == ["first", "second"]
+        client.disconnect()
+
+
 class TestContextManager:
     """Tests for context manager usage."""
 
@@ -20,6 +20,7 @@ from .types import (
     LogLevel,
     LogOptions,
     TimberlogsConfig,
+    log_options,
 )
 
 __version__ = "1.0.0"
@@ -35,6 +36,7 @@ __all__ = [
     "Environment",
     "LogEntry",
     "LogOptions",
+    "log_options",
     "TimberlogsConfig",
     # Version
     "__version__",
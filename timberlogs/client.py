@@ -3,10 +3,15 @@
 from __future__ import annotations
 
 import asyncio
+import io
+import itertools
+import linecache
 import threading
-import traceback
 import time
-from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+import weakref
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 import httpx
 
@@ -26,6 +31,114 @@ F = TypeVar("F", bound="Flow")
 LOGS_ENDPOINT = "https://timberlogs-ingest.enaboapps.workers.dev/v1/logs"
 FLOWS_ENDPOINT = "https://timberlogs-ingest.enaboapps.workers.dev/v1/flows"
 
+# Per-thread scratch buffer for formatting error stacks.
+_tls = threading.local()
+
+
+def _ring_capacity(batch_size: int) -> int:
+    """Smallest power of two giving the ring slack beyond one batch."""
+    return 1 << (max(batch_size * 2, 8) - 1).bit_length()
+
+
+# Number of flow steps buffered locally before they are handed to the
+# client's ring in a single burst.
+_FLOW_BURST = 4
+
+# Source template for the per-instance enqueue function. Ring capacity,
+# slot mask, and batch threshold are formatted in as literals, and the hot
+# state (ring, indexes, reservation counter, flush callback) is captured in
+# closure cells, so each log call runs on fast local loads with no self.
+# attribute lookups at all.
+_ENQUEUE_TEMPLATE = '''\
+def _make_enqueue(seq, ring, prod, cons, flush, time_ns, sleep):
+    def _enqueue(level, message, data, tags, extra):
+        """Write one log into the ring buffer, flushing when a batch fills.
+
+        Specialized at client construction: ring geometry and the batch
+        threshold are compiled in as constants and the hot state is bound
+        in closure cells. ``extra`` carries the rarely-used payload fields
+        (userId override, requestId, error fields, flow fields) already
+        keyed in output form.
+        """
+        i = next(seq)
+        while i - cons.v >= {capacity}:
+            # Ring full while a flush is still draining: apply
+            # back-pressure by draining a batch inline before publishing.
+            flush()
+        ring[i & {mask}] = (level, message, data, tags, extra, time_ns())
+        # Publish strictly in reservation order: wait for every earlier
+        # reservation to publish first, so the head only ever moves
+        # forward and never strands a record another producer has
+        # already made visible. Uncontended, this is a single compare.
+        while prod.v != i:
+            sleep(0)
+        prod.v = i + 1
+        if i + 1 - cons.v >= {batch_size}:
+            flush()
+    return _enqueue
+'''
+
+
+class _Padded:
+    """A mutable counter padded out onto its own heap object.
+
+    Keeping the producer and consumer ring indexes on separately allocated
+    objects stops them from sharing a cache line, so heavy logging on one
+    core does not keep invalidating the line the flush thread is reading
+    (MCRingBuffer-style cache-line protection).
+    """
+
+    __slots__ = ("v", "_pad")
+
+    def __init__(self) -> None:
+        self.v = 0
+        self._pad = b"\x00" * 64
+
+
+def _format_error_stack(error: BaseException) -> str:
+    """Format an exception's traceback into a stack string.
+
+    Walks ``error.__traceback__`` directly into a reusable thread-local
+    buffer instead of going through ``traceback.format_exception``, which
+    allocates a list of formatted strings per call. The output matches the
+    familiar traceback layout, ending with ``"{Type}: {message}"``.
+
+    The result is cached on the exception itself, so logging the same
+    exception repeatedly (e.g. from a retry loop) formats its traceback
+    only once; a raised exception's traceback no longer changes.
+    """
+    cached: Optional[str] = getattr(error, "__timberlogs_stack__", None)
+    if cached is not None:
+        return cached
+
+    sio = getattr(_tls, "sio", None)
+    if sio is None:
+        sio = _tls.sio = io.StringIO()
+    else:
+        sio.seek(0)
+        sio.truncate()
+
+    tb = error.__traceback__
+    if tb is not None:
+        sio.write("Traceback (most recent call last):\n")
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        sio.write(
+            f'  File "{code.co_filename}", line {tb.tb_lineno}, '
+            f"in {code.co_name}\n"
+        )
+        line = linecache.getline(code.co_filename, tb.tb_lineno).strip()
+        if line:
+            sio.write(f"    {line}\n")
+        tb = tb.tb_next
+    sio.write(f"{type(error).__name__}: {error}\n")
+    stack = sio.getvalue()
+    try:
+        object.__setattr__(error, "__timberlogs_stack__", stack)
+    except (AttributeError, TypeError):
+        pass  # Exceptions with __slots__ cannot carry the cache.
+    return stack
+
 
 class Flow:
     """
@@ -51,6 +164,18 @@ class Flow:
         self._name = name
         self._client = client
         self._step_index = 0
+        # Constant flow fields, copied in one dict merge per step instead of
+        # being rebuilt key-by-key on every chained call.
+        self._flow_env = {"flowId": flow_id}
+        # Steps buffered for burst enqueue; drained once _FLOW_BURST is
+        # reached, when the client flushes, or — via the finalizer — when
+        # the flow is garbage-collected, so accepted steps are never lost.
+        # _drain empties this list in place rather than replacing it, so the
+        # finalizer always sees the live buffer.
+        self._pending: List[Tuple[Any, ...]] = []
+        self._finalizer = weakref.finalize(
+            self, Flow._drain_records, client, self._pending
+        )
 
     @property
     def id(self) -> str:
@@ -71,32 +196,53 @@ class Flow:
         error: Optional[Exception] = None,
     ) -> "Flow":
         """Internal logging method."""
-        if not self._client.should_log(level):
+        client = self._client
+        if not client._enabled[LOG_LEVEL_PRIORITY[level]]:
             return self
 
-        entry = LogEntry(
-            level=level,
-            message=message,
-            data=data,
-            tags=options.tags if options else None,
-            flow_id=self._id,
-            step_index=self._step_index,
-        )
+        extra = dict(self._flow_env, stepIndex=self._step_index)
+        self._step_index += 1
 
         # Handle error objects
         if error is not None:
-            entry.error_name = type(error).__name__
-            entry.error_stack = "".join(
-                traceback.format_exception(type(error), error, error.__traceback__)
+            extra["errorName"] = type(error).__name__
+            extra["errorStack"] = _format_error_stack(error)
+            if data is None:
+                data = {}
+            data["message"] = str(error)
+
+        self._pending.append(
+            (
+                level,
+                message,
+                data,
+                options.tags if options else None,
+                extra,
+                time.time_ns(),
             )
-            if entry.data is None:
-                entry.data = {}
-            entry.data["message"] = str(error)
-
-        self._client.log(entry)
-        self._step_index += 1
+        )
+        if len(self._pending) >= _FLOW_BURST:
+            self._drain()
         return self
 
+    def _drain(self) -> None:
+        """Hand any buffered steps to the client in one burst."""
+        Flow._drain_records(self._client, self._pending)
+
+    @staticmethod
+    def _drain_records(
+        client: "TimberlogsClient", pending: List[Tuple[Any, ...]]
+    ) -> None:
+        """Emit buffered steps; also runs as the flow's finalizer.
+
+        A staticmethod taking the buffer directly so the finalizer holds no
+        reference to the flow itself.
+        """
+        if pending:
+            records = list(pending)
+            del pending[:]
+            client._emit_many(records)
+
     def debug(
         self,
         message: str,
@@ -192,9 +338,79 @@ class TimberlogsClient:
             config: The client configuration.
         """
         self._config = config
-        self._queue: List[Dict[str, Any]] = []
-        self._user_id = config.user_id
-        self._session_id = config.session_id
+        # Default user/session context packed into one tuple: setters swap
+        # the whole tuple and the emit path unpacks it with a single read,
+        # so updating or reading the context never touches a dict.
+        self._ctx: Tuple[Optional[str], Optional[str]] = (
+            config.user_id,
+            config.session_id,
+        )
+
+        # Precomputed level filter: one tuple lookup per call instead of two
+        # dict lookups and an integer compare. Indexed by level priority.
+        min_idx = LOG_LEVEL_PRIORITY[config.min_level]
+        self._enabled = tuple(
+            i >= min_idx for i in range(len(LOG_LEVEL_PRIORITY))
+        )
+
+        # Read-only envelope of per-client constants, shared by reference and
+        # merged into each payload in a single C-level dict copy at flush
+        # time instead of being copied field-by-field into every log call.
+        envelope: Dict[str, Any] = {
+            "source": config.source,
+            "environment": config.environment,
+        }
+        if config.version:
+            envelope["version"] = config.version
+        self._envelope: "MappingProxyType[str, Any]" = MappingProxyType(envelope)
+
+        # Fixed-capacity MPSC ring buffer. Producers reserve a slot through
+        # an itertools.count (whose __next__ is atomic in CPython) and
+        # publish their record with a single slot assignment, so the log
+        # path takes no lock; only the consumer side (flushes) serializes on
+        # self._lock. Capacity leaves slack beyond one batch so producers
+        # can keep logging while a flush drains.
+        capacity = _ring_capacity(config.batch_size)
+        self._capacity = capacity
+        self._mask = capacity - 1
+        self._ring: List[Optional[Tuple[Any, ...]]] = [None] * capacity
+        self._seq = itertools.count()
+        self._prod = _Padded()  # highest published slot + 1 (producer side)
+        self._cons = _Padded()  # next slot to consume (flush side)
+
+        # Live flows, tracked so their buffered steps drain on flush.
+        self._flows: "weakref.WeakSet[Flow]" = weakref.WeakSet()
+
+        # Compile the specialized enqueue function for this instance.
+        namespace: Dict[str, Any] = {}
+        exec(
+            compile(
+                _ENQUEUE_TEMPLATE.format(
+                    capacity=capacity,
+                    mask=self._mask,
+                    batch_size=config.batch_size,
+                ),
+                "<timberlogs._enqueue>",
+                "exec",
+            ),
+            namespace,
+        )
+        self._enqueue: Callable[..., None] = namespace["_make_enqueue"](
+            self._seq,
+            self._ring,
+            self._prod,
+            self._cons,
+            self._flush_http,
+            time.time_ns,
+            time.sleep,
+        )
+
+        # Payloads from a failed flush, waiting to be retried first next time.
+        self._requeued: List[Dict[str, Any]] = []
+
+        # Small pool of batch lists handed to flushes, so the steady state
+        # reuses the same lists instead of allocating one per flush cycle.
+        self._batch_pool: List[List[Dict[str, Any]]] = [[] for _ in range(2)]
         self._http_client: Optional[httpx.Client] = None
         self._async_http_client: Optional[httpx.AsyncClient] = None
         self._flush_timer: Optional[threading.Timer] = None
@@ -209,7 +425,10 @@ class TimberlogsClient:
         """Start the HTTP transport for sending logs."""
         self._http_client = httpx.Client(timeout=30.0)
         self._running = True
-        self._schedule_flush()
+        # flush_interval == 0 disables auto-flush entirely: no timer thread
+        # is ever created and batches go out only on size or explicit flush.
+        if self._config.flush_interval > 0:
+            self._schedule_flush()
 
     def _schedule_flush(self) -> None:
         """Schedule the next auto-flush."""
@@ -236,7 +455,7 @@ class TimberlogsClient:
         Returns:
             True if the log should be sent.
         """
-        return LOG_LEVEL_PRIORITY[level] >= LOG_LEVEL_PRIORITY[self._config.min_level]
+        return self._enabled[LOG_LEVEL_PRIORITY[level]]
 
     def set_user_id(self, user_id: Optional[str]) -> "TimberlogsClient":
         """Set the default user ID for subsequent logs.
@@ -247,7 +466,7 @@ class TimberlogsClient:
         Returns:
             self for method chaining.
         """
-        self._user_id = user_id
+        self._ctx = (user_id, self._ctx[1])
         return self
 
     def set_session_id(self, session_id: Optional[str]) -> "TimberlogsClient":
@@ -259,9 +478,19 @@ class TimberlogsClient:
         Returns:
             self for method chaining.
         """
-        self._session_id = session_id
+        self._ctx = (self._ctx[0], session_id)
         return self
 
+    @property
+    def _user_id(self) -> Optional[str]:
+        """Current default user ID (view into the packed context tuple)."""
+        return self._ctx[0]
+
+    @property
+    def _session_id(self) -> Optional[str]:
+        """Current default session ID (view into the packed context tuple)."""
+        return self._ctx[1]
+
     def _build_log_payload(self, entry: LogEntry) -> Dict[str, Any]:
         """Build the full log payload with config defaults."""
         payload = entry.to_dict()
@@ -279,6 +508,86 @@ class TimberlogsClient:
 
         return payload
 
+    def _emit_many(self, records: List[Tuple[Any, ...]]) -> None:
+        """Publish a burst of records with a single flush check at the end.
+
+        Counterpart to ``_enqueue`` for callers that already hold a run of
+        records (e.g. chained flow steps), saving the per-record
+        batch-threshold check. Each record still publishes the head in
+        reservation order — see the enqueue template — so the head never
+        moves backwards past a record another producer has made visible.
+        """
+        if not records:
+            return
+        i = 0
+        for record in records:
+            i = next(self._seq)
+            while i - self._cons.v >= self._capacity:
+                self._flush_http()
+            self._ring[i & self._mask] = record
+            while self._prod.v != i:
+                time.sleep(0)
+            self._prod.v = i + 1
+        if i + 1 - self._cons.v >= self._config.batch_size:
+            self._flush_http()
+
+    def _materialize(self) -> List[Dict[str, Any]]:
+        """Drain the batch buffer into payload dicts (caller holds the lock).
+
+        Any payloads re-queued by a failed flush are returned first so they
+        keep their original ordering. The returned list comes from the batch
+        pool and must be given back via ``_release_batch`` once sent.
+        """
+        logs = self._batch_pool.pop() if self._batch_pool else []
+        if self._requeued:
+            logs.extend(self._requeued)
+            self._requeued.clear()
+
+        env = self._envelope
+        user_id, session_id = self._ctx
+        ring = self._ring
+        mask = self._mask
+
+        head = self._prod.v
+        tail = self._cons.v
+        while tail < head:
+            slot = tail & mask
+            record = ring[slot]
+            if record is None:
+                # Reserved by a producer that has not published yet; stop
+                # here and pick the rest up on the next flush.
+                break
+            ring[slot] = None
+            level, message, data, tags, extra, ts_ns = record
+            payload = dict(env)
+            payload["level"] = level
+            payload["message"] = message
+            payload["timestamp"] = datetime.fromtimestamp(
+                ts_ns / 1e9, tz=timezone.utc
+            ).isoformat()
+            if data is not None:
+                payload["data"] = data
+            if tags is not None:
+                # Tags may be cached tuples; payloads carry a JSON array.
+                payload["tags"] = list(tags)
+            if extra:
+                payload.update(extra)
+            if user_id and "userId" not in payload:
+                payload["userId"] = user_id
+            if session_id and "sessionId" not in payload:
+                payload["sessionId"] = session_id
+            logs.append(payload)
+            tail += 1
+        self._cons.v = tail
+        return logs
+
+    def _release_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Return a drained batch list to the pool for reuse."""
+        del batch[:]
+        with self._lock:
+            if len(self._batch_pool) < 2:
+                self._batch_pool.append(batch)
+
     def log(self, entry: LogEntry) -> "TimberlogsClient":
         """Log an entry with full control.
 
@@ -291,14 +600,28 @@ class TimberlogsClient:
         if not self.should_log(entry.level):
             return self
 
-        payload = self._build_log_payload(entry)
-
-        # Queue for HTTP transport
-        with self._lock:
-            self._queue.append(payload)
-            if len(self._queue) >= self._config.batch_size:
-                self._flush_http()
+        fields = entry.to_dict()
+        extra = {
+            key: value
+            for key, value in fields.items()
+            if key not in ("level", "message", "data", "tags")
+        }
+        self._enqueue(
+            entry.level, entry.message, entry.data, entry.tags, extra or None
+        )
+        return self
 
+    def _emit(
+        self,
+        level: LogLevel,
+        message: str,
+        data: Optional[Dict[str, Any]],
+        options: Optional[LogOptions],
+    ) -> "TimberlogsClient":
+        """Enqueue a log that has already passed the level filter."""
+        self._enqueue(
+            level, message, data, options.tags if options else None, None
+        )
         return self
 
     def debug(
@@ -317,14 +640,9 @@ class TimberlogsClient:
         Returns:
             self for method chaining.
         """
-        return self.log(
-            LogEntry(
-                level="debug",
-                message=message,
-                data=data,
-                tags=options.tags if options else None,
-            )
-        )
+        if not self._enabled[0]:
+            return self
+        return self._emit("debug", message, data, options)
 
     def info(
         self,
@@ -342,14 +660,9 @@ class TimberlogsClient:
         Returns:
             self for method chaining.
         """
-        return self.log(
-            LogEntry(
-                level="info",
-                message=message,
-                data=data,
-                tags=options.tags if options else None,
-            )
-        )
+        if not self._enabled[1]:
+            return self
+        return self._emit("info", message, data, options)
 
     def warn(
         self,
@@ -367,14 +680,9 @@ class TimberlogsClient:
         Returns:
             self for method chaining.
         """
-        return self.log(
-            LogEntry(
-                level="warn",
-                message=message,
-                data=data,
-                tags=options.tags if options else None,
-            )
-        )
+        if not self._enabled[2]:
+            return self
+        return self._emit("warn", message, data, options)
 
     def error(
         self,
@@ -392,34 +700,32 @@ class TimberlogsClient:
         Returns:
             self for method chaining.
         """
-        entry = LogEntry(
-            level="error",
-            message=message,
-            tags=options.tags if options else None,
-        )
+        if not self._enabled[3]:
+            return self
 
         if isinstance(error_or_data, Exception):
-            entry.error_name = type(error_or_data).__name__
-            entry.error_stack = "".join(
-                traceback.format_exception(
-                    type(error_or_data), error_or_data, error_or_data.__traceback__
-                )
+            extra = {
+                "errorName": type(error_or_data).__name__,
+                "errorStack": _format_error_stack(error_or_data),
+            }
+            self._enqueue(
+                "error",
+                message,
+                {"message": str(error_or_data)},
+                options.tags if options else None,
+                extra,
             )
-            entry.data = {"message": str(error_or_data)}
-        elif error_or_data is not None:
-            entry.data = error_or_data
+            return self
 
-        return self.log(entry)
+        return self._emit("error", message, error_or_data, options)
 
     def _flush_http(self) -> None:
         """Flush logs via HTTP with retry logic."""
         with self._lock:
-            if not self._queue:
-                return
-            logs = self._queue.copy()
-            self._queue.clear()
+            logs = self._materialize()
 
-        if not self._http_client or not self._config.api_key:
+        if not logs or not self._http_client or not self._config.api_key:
+            self._release_batch(logs)
             return
 
         retry_config = self._config.retry
@@ -441,6 +747,7 @@ class TimberlogsClient:
                     },
                 )
                 response.raise_for_status()
+                self._release_batch(logs)
                 return  # Success
             except Exception as e:
                 last_error = e
@@ -448,12 +755,15 @@ class TimberlogsClient:
                     time.sleep(delay_ms / 1000)
                     delay_ms = min(delay_ms * 2, max_delay_ms)
 
-        # All retries failed, re-queue logs and handle error
+        # All retries failed: copy out of the pooled list, re-queue, and
+        # handle the error.
+        failed = list(logs)
+        self._release_batch(logs)
         with self._lock:
-            self._queue = logs + self._queue
+            self._requeued = failed + self._requeued
 
         if last_error:
-            self._handle_error(last_error, logs)
+            self._handle_error(last_error, failed)
 
     def _handle_error(
         self, error: Exception, logs: Optional[List[Dict[str, Any]]] = None
@@ -466,17 +776,25 @@ class TimberlogsClient:
 
     def flush(self) -> None:
         """Immediately send all queued logs."""
+        for flow in list(self._flows):
+            flow._drain()
+        # Nothing buffered (the common case for short-lived clients and
+        # context-manager exits): skip the lock and batch machinery.
+        if self._prod.v == self._cons.v and not self._requeued:
+            return
         self._flush_http()
 
     async def flush_async(self) -> None:
         """Asynchronously send all queued logs."""
+        for flow in list(self._flows):
+            flow._drain()
+        if self._prod.v == self._cons.v and not self._requeued:
+            return
         with self._lock:
-            if not self._queue:
-                return
-            logs = self._queue.copy()
-            self._queue.clear()
+            logs = self._materialize()
 
-        if not self._config.api_key:
+        if not logs or not self._config.api_key:
+            self._release_batch(logs)
             return
 
         if self._async_http_client is None:
@@ -501,6 +819,7 @@ class TimberlogsClient:
                     },
                 )
                 response.raise_for_status()
+                self._release_batch(logs)
                 return  # Success
             except Exception as e:
                 last_error = e
@@ -508,12 +827,15 @@ class TimberlogsClient:
                     await asyncio.sleep(delay_ms / 1000)
                     delay_ms = min(delay_ms * 2, max_delay_ms)
 
-        # All retries failed, re-queue logs and handle error
+        # All retries failed: copy out of the pooled list, re-queue, and
+        # handle the error.
+        failed = list(logs)
+        self._release_batch(logs)
         with self._lock:
-            self._queue = logs + self._queue
+            self._requeued = failed + self._requeued
 
         if last_error:
-            self._handle_error(last_error, logs)
+            self._handle_error(last_error, failed)
 
     def flow(self, name: str) -> Flow:
         """Create a new flow for tracking related logs synchronously.
@@ -532,7 +854,9 @@ class TimberlogsClient:
 
         suffix = secrets.token_hex(4)
         flow_id = f"{name}-{suffix}"
-        return Flow(flow_id, name, self)
+        flow = Flow(flow_id, name, self)
+        self._flows.add(flow)
+        return flow
 
     async def flow_async(self, name: str) -> Flow:
         """Create a new flow with server-generated flow ID.
@@ -563,7 +887,9 @@ class TimberlogsClient:
         response.raise_for_status()
         data = response.json()
 
-        return Flow(data["flowId"], data["name"], self)
+        flow = Flow(data["flowId"], data["name"], self)
+        self._flows.add(flow)
+        return flow
 
     def disconnect(self) -> None:
         """Flush logs and stop the client."""
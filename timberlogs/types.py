@@ -1,7 +1,18 @@
 """Type definitions for the Timberlogs SDK."""
 
+import sys
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Literal, Optional, TypedDict
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypedDict,
+)
 
 # Type aliases
 LogLevel = Literal["debug", "info", "warn", "error"]
@@ -35,9 +46,28 @@ class LogEntryDict(TypedDict, total=False):
     step_index: Optional[int]
 
 
-@dataclass
+# Optional LogEntry attributes and their camelCase output keys, applied in
+# one table-driven pass during serialization instead of per-field branches.
+_REMAP = (
+    ("data", "data"),
+    ("user_id", "userId"),
+    ("session_id", "sessionId"),
+    ("request_id", "requestId"),
+    ("error_name", "errorName"),
+    ("error_stack", "errorStack"),
+    ("tags", "tags"),
+    ("flow_id", "flowId"),
+    ("step_index", "stepIndex"),
+)
+
+
+@dataclass(frozen=True)
 class LogEntry:
-    """A log entry to be sent to Timberlogs."""
+    """A log entry to be sent to Timberlogs.
+
+    Entries are immutable once constructed; use ``dataclasses.replace`` to
+    derive a modified copy.
+    """
 
     level: LogLevel
     message: str
@@ -57,35 +87,44 @@ class LogEntry:
             "level": self.level,
             "message": self.message,
         }
-        if self.data is not None:
-            result["data"] = self.data
-        if self.user_id is not None:
-            result["userId"] = self.user_id
-        if self.session_id is not None:
-            result["sessionId"] = self.session_id
-        if self.request_id is not None:
-            result["requestId"] = self.request_id
-        if self.error_name is not None:
-            result["errorName"] = self.error_name
-        if self.error_stack is not None:
-            result["errorStack"] = self.error_stack
-        if self.tags is not None:
-            result["tags"] = self.tags
-        if self.flow_id is not None:
-            result["flowId"] = self.flow_id
-        if self.step_index is not None:
-            result["stepIndex"] = self.step_index
+        for attr, key in _REMAP:
+            value = getattr(self, attr)
+            if value is not None:
+                result[key] = value
         return result
 
 
-@dataclass
+@dataclass(frozen=True)
 class LogOptions:
-    """Options that can be passed to logging methods."""
+    """Options that can be passed to logging methods.
 
-    tags: Optional[List[str]] = None
+    Tags are normalized to a tuple of interned strings on construction, so
+    repeated tag sets share storage and compare by pointer. Lists are
+    accepted for convenience; serialized payloads still carry tags as a
+    JSON array.
+    """
+
+    tags: Optional[Tuple[str, ...]] = None
+
+    def __post_init__(self) -> None:
+        if self.tags is not None:
+            object.__setattr__(
+                self, "tags", tuple(sys.intern(tag) for tag in self.tags)
+            )
+
+
+@lru_cache(maxsize=128)
+def log_options(*tags: str) -> LogOptions:
+    """Return a shared ``LogOptions`` for the given tags.
+
+    Repeated calls with the same tags hit an LRU cache, so hot paths that
+    tag every log reuse one instance instead of allocating per call. The
+    returned instance is shared and must not be mutated.
+    """
+    return LogOptions(tags=tags)
 
 
-@dataclass
+@dataclass(frozen=True)
 class TimberlogsConfig:
     """Configuration for the Timberlogs client."""
 
@@ -125,6 +164,7 @@ __all__ = [
     "LogEntry",
     "LogEntryDict",
     "LogOptions",
+    "log_options",
     "TimberlogsConfig",
     "LOG_LEVEL_PRIORITY",
 ]